@@ -1,7 +1,9 @@
-import json
+import queue
+import threading
 from typing import Callable
 from urllib.parse import urlparse
 
+import orjson
 import requests
 import upnpclient
 from websockets.legacy.client import WebSocketClientProtocol
@@ -22,7 +24,7 @@ from vibin.types import (
     UPnPProperties,
     AmplifierAction,
 )
-from vibin.utils import WebsocketThread
+from vibin.utils import StoppableThread, WebsocketThread
 
 
 class StreamMagic(Amplifier):
@@ -64,6 +66,43 @@ class StreamMagic(Amplifier):
         self._state_data = None
         self._max_volume_step = None
 
+        # Cache of the last-computed AmplifierState. Invalidated whenever a
+        # state message changes the underlying state data, so the pydantic
+        # model isn't rebuilt on every device_state access. The supported
+        # actions are also kept as a frozenset for cheap membership checks
+        # by the control setters (supported_actions stays a list on the
+        # AmplifierState itself).
+        self._device_state_cache: AmplifierState | None = None
+        self._supported_action_set: frozenset[AmplifierAction] = frozenset()
+
+        # Use a single keep-alive session for state requests, so rapid
+        # control calls (e.g. volume scrubbing) reuse one TCP connection
+        # rather than paying connection setup per request.
+        # The state request URL is on the volume-ramp hot path, so it's built
+        # once here rather than per request (per-request parameters are passed
+        # via requests' params= instead).
+        self._state_url = f"http://{self._device_hostname}/smoip/zone/state"
+        self._http_session = requests.Session()
+        self._http_session.mount(
+            "http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        )
+
+        # State requests are sent from a dedicated thread, so control calls
+        # (e.g. the volume setter) don't block the caller on the network.
+        self._send_queue: queue.Queue[tuple[str, str]] = queue.Queue()
+        self._send_queue_timeout = 1
+        self._state_request_thread = StoppableThread(
+            target=self._process_state_requests
+        )
+        self._state_request_thread.start()
+
+        # Incoming state messages can arrive in rapid bursts (e.g. while a
+        # volume knob is being turned). System updates are coalesced over a
+        # short window so only the most recent state is announced.
+        self._update_flush_interval = 0.05
+        self._update_flush_lock = threading.Lock()
+        self._update_flush_timer: threading.Timer | None = None
+
         self._websocket_thread = WebsocketThread(
             uri=f"ws://{self._device_hostname}:80/smoip",
             friendly_name=self._device.friendly_name,
@@ -91,7 +130,13 @@ class StreamMagic(Amplifier):
     @property
     def device_state(self) -> AmplifierState:
         """System state for the Amplifier."""
-        return self._compute_amplifier_state()
+        if self._device_state_cache is None:
+            self._device_state_cache = self._compute_amplifier_state()
+            self._supported_action_set = frozenset(
+                self._device_state_cache.supported_actions
+            )
+
+        return self._device_state_cache
 
     @property
     def device_udn(self) -> str:
@@ -104,6 +149,16 @@ class StreamMagic(Amplifier):
 
     def on_shutdown(self) -> None:
         """Called when the Vibin system is shut down."""
+        with self._update_flush_lock:
+            if self._update_flush_timer is not None:
+                self._update_flush_timer.cancel()
+                self._update_flush_timer = None
+
+        if self._state_request_thread:
+            logger.info(f"Stopping state request thread for {self.name}")
+            self._state_request_thread.stop()
+            self._state_request_thread.join()
+
         logger.info(f"Stopping WebSocket thread for {self.name}")
         if self._websocket_thread:
             self._websocket_thread.stop()
@@ -148,17 +203,17 @@ class StreamMagic(Amplifier):
     @volume.setter
     def volume(self, volume: int) -> None:
         """Set the volume (zero to max_volume). No-op if not supported."""
-        if "volume" in self.device_state.supported_actions:
+        if self._supports("volume"):
             self._send_state_request("volume_step", str(volume))
 
     def volume_up(self) -> None:
         """Increase the volume by one unit."""
-        if "volume_up_down" in self.device_state.supported_actions:
+        if self._supports("volume_up_down"):
             self._send_state_request("volume_step_change", "1")
 
     def volume_down(self) -> None:
         """Decrease the volume by one unit."""
-        if "volume_up_down" in self.device_state.supported_actions:
+        if self._supports("volume_up_down"):
             self._send_state_request("volume_step_change", "-1")
 
     @property
@@ -169,12 +224,12 @@ class StreamMagic(Amplifier):
     @mute.setter
     def mute(self, state: MuteState) -> None:
         """Set the mute state."""
-        if "mute" in self.device_state.supported_actions:
+        if self._supports("mute"):
             self._send_state_request("mute", "true" if state == "on" else "false")
 
     def mute_toggle(self) -> None:
         """Toggle the mute state."""
-        if "mute" in self.device_state.supported_actions:
+        if self._supports("mute"):
             self._send_state_request(
                 "mute", "false" if self.device_state.mute == "on" else "true"
             )
@@ -221,9 +276,21 @@ class StreamMagic(Amplifier):
             self._on_connect()
 
     def _handle_websocket_message(self, message: Data):
+        # Cheap pre-parse check: this handler only acts on zone-state
+        # messages ("/zone/state" and "/zone/state/spec"), so skip the JSON
+        # parse entirely for anything else the streamer might send.
+        if isinstance(message, bytes):
+            if b'"/zone/state' not in message:
+                return
+        elif '"/zone/state' not in message:
+            return
+
         try:
-            parsed = json.loads(message)
-        except json.decoder.JSONDecodeError:
+            # orjson is used here as this is a hot path (the streamer can
+            # emit many state messages per second); it also accepts bytes
+            # frames directly.
+            parsed = orjson.loads(message)
+        except orjson.JSONDecodeError:
             return
 
         if "path" not in parsed:
@@ -232,28 +299,88 @@ class StreamMagic(Amplifier):
         match parsed["path"]:
             case "/zone/state":
                 self._state_data = parsed["params"]["data"]
-                self._on_update("System", self.device_state)
+                self._on_state_data_changed()
             case "/zone/state/spec":
                 try:
                     # volume_step is only present in pre-amp mode
                     self._max_volume_step = parsed["params"]["data"]["volume_step"][
                         "maximum"
                     ]
-                    self._on_update("System", self.device_state)
+                    self._on_state_data_changed()
                 except KeyError:
                     pass
             case _:
                 pass
 
+    def _supports(self, action: AmplifierAction) -> bool:
+        """Whether the amplifier currently supports the given action.
+
+        Checks against the frozenset maintained alongside the cached
+        AmplifierState, so repeated control calls don't scan the
+        supported_actions list.
+        """
+        if self._device_state_cache is None:
+            # Refresh the cached state (and with it the action set).
+            _ = self.device_state
+
+        return action in self._supported_action_set
+
+    def _on_state_data_changed(self):
+        """Handle a change to the underlying amplifier state data.
+
+        Recomputes the AmplifierState, and only schedules a System update
+        if the state actually differs from the previously-announced state
+        (many incoming state messages don't change anything we care
+        about).
+        """
+        previous_state = self._device_state_cache
+        self._device_state_cache = None
+
+        if self.device_state != previous_state:
+            self._schedule_system_update()
+
+    def _schedule_system_update(self):
+        """Schedule the send of a System update message.
+
+        Consecutive state messages supersede one another, so rather than
+        sending a System update per incoming message, a single send is
+        scheduled for a short time in the future. Any further state updates
+        arriving before the send takes place are covered by the
+        already-scheduled send (which always announces the latest state).
+        """
+        if self._on_update is None:
+            return
+
+        with self._update_flush_lock:
+            if self._update_flush_timer is not None:
+                return
+
+            self._update_flush_timer = threading.Timer(
+                self._update_flush_interval, self._flush_system_update
+            )
+            self._update_flush_timer.daemon = True
+            self._update_flush_timer.start()
+
+    def _flush_system_update(self):
+        """Send a System update message with the current amplifier state."""
+        with self._update_flush_lock:
+            self._update_flush_timer = None
+
+        self._on_update("System", self.device_state)
+
     def _compute_amplifier_state(self) -> AmplifierState:
         """Converts the state messages to an AmplifierState.
 
         Reports the current power status, so that the Vibin UI can grey out
         controls if the streamer isn't currently available, even though this
         implementation doesn't support controlling the power.
+
+        The AmplifierState is built with construct() to skip pydantic field
+        validation; all values here are produced locally from the incoming
+        state data, and this runs for every state change.
         """
         if self._state_data and self._state_data["pre_amp_mode"]:
-            return AmplifierState(
+            return AmplifierState.construct(
                 name=self._device.friendly_name,
                 supported_actions=["volume", "mute", "volume_up_down"],
                 power=None,
@@ -263,7 +390,7 @@ class StreamMagic(Amplifier):
                 sources=None,
             )
         elif self._state_data and self._state_data["cbus"] in ["amplifier", "receiver"]:
-            return AmplifierState(
+            return AmplifierState.construct(
                 name=self._device.friendly_name,
                 supported_actions=["volume_up_down"],
                 power=None,
@@ -272,18 +399,8 @@ class StreamMagic(Amplifier):
                 volume=None,
                 sources=None,
             )
-        elif self._state_data:
-            return AmplifierState(
-                name=self._device.friendly_name,
-                supported_actions=[],
-                power=None,
-                mute=None,
-                max_volume=None,
-                volume=None,
-                sources=None,
-            )
         else:
-            return AmplifierState(
+            return AmplifierState.construct(
                 name=self._device.friendly_name,
                 supported_actions=[],
                 power=None,
@@ -294,4 +411,44 @@ class StreamMagic(Amplifier):
             )
 
     def _send_state_request(self, param: str, value: str):
-        requests.get(f"http://{self._device_hostname}/smoip/zone/state?{param}={value}")
+        self._send_queue.put_nowait((param, value))
+
+    def _process_state_requests(self):
+        """Send queued state requests to the streamer.
+
+        Runs as the target of the state request thread. Before sending,
+        any queued requests for the same parameter are coalesced down to
+        the most recent value (only the last value in a burst of volume
+        sets matters), so a flood of control calls collapses into a
+        handful of HTTP requests.
+        """
+        while True:
+            try:
+                param, value = self._send_queue.get(timeout=self._send_queue_timeout)
+            except queue.Empty:
+                if self._state_request_thread.stop_event.is_set():
+                    logger.info(f"State request thread for {self.name} stopped")
+                    return
+
+                continue
+
+            # Coalesce any other already-queued requests, keeping only the
+            # most recent value per parameter.
+            pending = {param: value}
+
+            try:
+                while True:
+                    param, value = self._send_queue.get_nowait()
+                    pending[param] = value
+            except queue.Empty:
+                pass
+
+            for param, value in pending.items():
+                try:
+                    self._http_session.get(
+                        self._state_url, params={param: value}, timeout=2
+                    )
+                except requests.RequestException as e:
+                    logger.warning(
+                        f"Could not send state request to {self.name}: {e}"
+                    )
@@ -92,6 +92,11 @@ class Vibin:
         self._on_update_handlers: list[UpdateMessageHandler] = []
         self._last_played_id = None
 
+        # Cached upnp_properties payload. Invalidated whenever a UPnP event
+        # changes the underlying device properties, so repeat reads between
+        # events don't rebuild the payload.
+        self._upnp_properties_cache = None
+
         # Configure external services
         self._external_services: dict[str, ExternalService] = {}
 
@@ -325,12 +330,13 @@ class Vibin:
     def upnp_properties(self):
         """The current UPnP properties for the Streamer and MediaServer devices."""
 
-        all_upnp_properties = {
-            "streamer": self.streamer.upnp_properties,
-            "media_server": self.media_server.upnp_properties if self.media_server else None,
-        }
+        if self._upnp_properties_cache is None:
+            self._upnp_properties_cache = {
+                "streamer": self.streamer.upnp_properties,
+                "media_server": self.media_server.upnp_properties if self.media_server else None,
+            }
 
-        return all_upnp_properties
+        return self._upnp_properties_cache
 
     def get_current_state_messages(self) -> list[UpdateMessage]:
         """Return a list of UpdateMessages reflecting the current state of the
@@ -466,8 +472,15 @@ class Vibin:
                     + f"for the {service_name} service: {device}"
                 )
 
-            # Send updated state vars to interested recipients.
-            self._send_update("UPnPProperties", self.upnp_properties)
+            # The event will have changed the underlying device properties,
+            # so the cached payload is now stale.
+            self._upnp_properties_cache = None
+
+            # Send updated state vars to interested recipients. The
+            # upnp_properties payload is only built if there's at least one
+            # registered handler to receive it.
+            if self._on_update_handlers:
+                self._send_update("UPnPProperties", self.upnp_properties)
 
     def _get_db_details(
         self, database: DatabaseName
@@ -669,6 +682,9 @@ class Vibin:
 
     def _send_update(self, message_type: UpdateMessageType, data: Any):
         """Send an update message to all registered update handlers."""
+        if not self._on_update_handlers:
+            return
+
         if message_type == "System":
             # A device might want to send a System message, but it only provides
             # its own state. Intercept this and instead send a complete System
@@ -1,9 +1,19 @@
+import concurrent.futures
+import functools
 import inspect
-import json
+import re
+import select
+import socket
+import threading
+import time
 from urllib.parse import urlparse
+from xml.etree import ElementTree
 
+import orjson
 import requests
 import upnpclient
+import upnpclient.ssdp
+import urllib3.util
 
 from vibin import VibinError
 from vibin.amplifiers import model_to_amplifier, Amplifier
@@ -16,37 +26,295 @@ from vibin.streamers import model_to_streamer, Streamer
 
 _upnp_devices = None
 
+# Guards discovery, so concurrent callers (e.g. the parallel media server and
+# amplifier lookups) can't each kick off their own SSDP scan.
+_discovery_lock = threading.Lock()
+
+# Lookup indexes over the cached _upnp_devices, built once per discovery so
+# the resolution helpers can do dict lookups instead of re-scanning the full
+# devices list for every predicate.
+_devices_by_type: dict[str, list[upnpclient.Device]] = {}
+_devices_by_manufacturer: dict[str, list[upnpclient.Device]] = {}
+_devices_by_friendly_name: dict[str, upnpclient.Device] = {}
+
+# Shared session for the device-resolution HTTP probes (e.g. the Cambridge
+# /smoip checks), so repeat requests to the same host reuse one TCP
+# connection instead of paying a fresh handshake each time. Transient
+# failures are retried with a short backoff rather than immediately falling
+# through to the (much slower) discovery paths.
+_http_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=urllib3.util.Retry(
+        total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)
+    ),
+)
+_http_session = requests.Session()
+_http_session.mount("http://", _http_adapter)
+_http_session.mount("https://", _http_adapter)
+
+# (connect, read) timeout for the HTTP probes: unreachable hosts fail fast
+# while slow-but-alive hosts still get a generous read window.
+_PROBE_TIMEOUT = (1.5, 8)
+
+# What a plausible hostname (or IPv4 address) looks like. Inputs which can't
+# be hostnames (e.g. friendly names containing spaces) skip the Cambridge
+# hostname probe entirely.
+_HOSTNAME_REGEX = re.compile(r"^[A-Za-z0-9.\-]+$")
+
 
 # =============================================================================
 # UPnP device discovery; Streamer/MediaServer class instance determination
 # =============================================================================
 
-def _discover_upnp_devices(timeout: int):
+def _peek_device_type(location: str) -> str | None:
+    """Cheaply determine the deviceType of the device described at the given
+    device description URL.
+
+    Fetches just the description XML and reads its <deviceType>, avoiding the
+    full upnpclient Device construction (which also fetches and parses every
+    service's SCPD) when only the device type is of interest. Returns None if
+    the description can't be fetched or parsed.
+    """
+    try:
+        response = _http_session.get(location, timeout=_PROBE_TIMEOUT)
+
+        return ElementTree.fromstring(response.content).findtext(
+            ".//{urn:schemas-upnp-org:device-1-0}deviceType"
+        )
+    except (requests.RequestException, ElementTree.ParseError):
+        return None
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_device(location: str) -> upnpclient.Device:
+    """Build an upnpclient Device for the given device description URL.
+
+    Constructing a Device fetches the description XML plus an SCPD XML per
+    service -- a dozen or so HTTP GETs for a typical streamer. Device
+    descriptions rarely change, so the constructed Device is memoized per
+    location and the various resolution paths below (which can describe the
+    same location more than once) only pay that cost once. Failed
+    constructions are not cached, so a flaky device can be retried.
+    """
+    return upnpclient.Device(location)
+
+
+def _describe_devices_at_locations(locations) -> list[upnpclient.Device]:
+    """Build upnpclient Devices for the given device description URLs.
+
+    Each Device construction involves HTTP GETs for the device's description
+    XML, so the fetches are performed concurrently -- with N devices on the
+    network, a discovery pass waits for the slowest responder rather than the
+    sum of all responders. Locations which can't be described (e.g. a device
+    which went away after announcing itself) are skipped.
+    """
+    devices = []
+
+    if not locations:
+        return devices
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(8, len(locations))
+    ) as executor:
+        futures = {
+            executor.submit(upnpclient.Device, location): location
+            for location in locations
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                devices.append(future.result())
+            except Exception as e:
+                logger.warning(
+                    f"Ignoring UPnP device description at {futures[future]}: {e}"
+                )
+
+    return devices
+
+
+_SSDP_TARGET = ("239.255.255.250", 1900)
+
+# The only UPnP device types Vibin is interested in.
+_SSDP_ST_MEDIA_RENDERER = "urn:schemas-upnp-org:device:MediaRenderer:1"
+_SSDP_ST_MEDIA_SERVER = "urn:schemas-upnp-org:device:MediaServer:1"
+
+
+def _ssdp_scan(search_targets: list[str], timeout: int, mx: int = 1) -> set[str]:
+    """Send SSDP M-SEARCH requests for the given search targets, returning the
+    set of device description URLs seen in the responses.
+
+    Modelled on upnpclient's own scan, but searching only for the given
+    targets rather than ssdp:all -- so only devices of interest respond (and
+    later have their descriptions fetched).
+
+    Devices are asked (via MX) to respond within mx seconds rather than
+    upnpclient's longer default. Once every search target has produced at
+    least one response, the scan stops as soon as the full MX response window
+    has elapsed, instead of waiting out the full timeout. Responders may
+    legally delay up to mx seconds after the M-SEARCH is sent, so the scan
+    never exits before then -- otherwise a late responder (e.g. the Cambridge
+    streamer, or a second MediaRenderer acting as the amplifier) could be
+    missed whenever other devices happen to answer first.
+    """
+    locations: set[str] = set()
+    sockets = []
+    ssdp_requests = [
+        upnpclient.ssdp.ssdp_request(search_target, ssdp_mx=mx)
+        for search_target in search_targets
+    ]
+    remaining_targets = set(search_targets)
+    stop_wait = time.monotonic() + timeout
+
+    for address in upnpclient.ssdp.get_addresses_ipv4():
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
+            sock.bind((address, 0))
+            sockets.append(sock)
+        except socket.error:
+            pass
+
+    for sock in list(sockets):
+        try:
+            for ssdp_request in ssdp_requests:
+                sock.sendto(ssdp_request, _SSDP_TARGET)
+            sock.setblocking(False)
+        except socket.error:
+            sockets.remove(sock)
+            sock.close()
+
+    # The earliest the scan may exit early: every responder honoring MX has
+    # had its full 0..mx response window, plus a small margin for network and
+    # processing delay.
+    responses_due = time.monotonic() + mx + 0.25
+
+    try:
+        while sockets:
+            seconds_left = stop_wait - time.monotonic()
+
+            if seconds_left <= 0:
+                break
+
+            ready = select.select(sockets, [], [], seconds_left)[0]
+
+            for sock in ready:
+                try:
+                    data, address = sock.recvfrom(1024)
+                    response = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    continue
+                except socket.error:
+                    sockets.remove(sock)
+                    sock.close()
+                    continue
+
+                found_locations = re.findall(
+                    r"LOCATION: *(?P<url>\S+)\s+", response, re.IGNORECASE
+                )
+
+                if found_locations:
+                    locations.add(found_locations[0])
+
+                if remaining_targets:
+                    found_st = re.search(
+                        r"^ST: *(?P<st>\S+)", response, re.IGNORECASE | re.MULTILINE
+                    )
+
+                    if found_st:
+                        remaining_targets.discard(found_st.group("st"))
+
+                        if not remaining_targets:
+                            # Every search target has responded; stop once the
+                            # MX response window has elapsed rather than
+                            # waiting out the full timeout. Never exit before
+                            # responses_due, so late-but-compliant responders
+                            # are still collected.
+                            stop_wait = min(stop_wait, responses_due)
+    finally:
+        for sock in sockets:
+            sock.close()
+
+    return locations
+
+
+def _index_devices(devices) -> None:
+    """Build the lookup indexes over the given discovered devices."""
+    global _devices_by_type, _devices_by_manufacturer, _devices_by_friendly_name
+
+    by_type: dict[str, list[upnpclient.Device]] = {}
+    by_manufacturer: dict[str, list[upnpclient.Device]] = {}
+    by_friendly_name: dict[str, upnpclient.Device] = {}
+
+    for device in devices:
+        # A device_type looks like "urn:schemas-upnp-org:device:MediaRenderer:1";
+        # the index is keyed on the device type token ("MediaRenderer").
+        type_parts = device.device_type.split(":")
+
+        if len(type_parts) >= 2:
+            by_type.setdefault(type_parts[-2], []).append(device)
+
+        by_manufacturer.setdefault(device.manufacturer, []).append(device)
+        by_friendly_name.setdefault(device.friendly_name, device)
+
+    _devices_by_type = by_type
+    _devices_by_manufacturer = by_manufacturer
+    _devices_by_friendly_name = by_friendly_name
+
+
+def _discover_upnp_devices(timeout: int, refresh: bool = False):
     """Perform a UPnP discovery of all devices on the local network.
 
-    Found devices are cached in case this gets called more than once. This
-    discovers all devices regardless of type.
+    Found devices are cached, so subsequent calls (e.g. a Vibin re-init, or
+    the later media server and amplifier lookups) don't pay the multi-second
+    SSDP discovery wait again. Pass refresh=True to force a new discovery
+    (e.g. if the network is known to have changed). This discovers all
+    devices regardless of type.
     """
     global _upnp_devices
 
-    if _upnp_devices is not None:
+    if _upnp_devices is not None and not refresh:
         return _upnp_devices
 
-    logger.info("Discovering UPnP devices...")
-    devices = upnpclient.discover(timeout=timeout)
-
-    for device in devices:
-        logger.info(
-            f"Found: {device.model_name} ('{device.friendly_name}') from {device.manufacturer}"
+    with _discovery_lock:
+        # Double-checked: another thread may have completed a discovery while
+        # this one was waiting on the lock.
+        if _upnp_devices is not None and not refresh:
+            return _upnp_devices
+
+        logger.info("Discovering UPnP devices...")
+
+        # Search only for the MediaRenderer/MediaServer device types Vibin
+        # cares about, so the rest of the LAN's UPnP population (TVs,
+        # printers, etc.) doesn't respond -- and doesn't need its description
+        # fetched. Fall back to a general scan if nothing responds to the
+        # targeted search.
+        locations = _ssdp_scan(
+            [_SSDP_ST_MEDIA_RENDERER, _SSDP_ST_MEDIA_SERVER], timeout
         )
 
-    _upnp_devices = devices
+        if not locations:
+            locations = {entry.location for entry in upnpclient.ssdp.scan(timeout)}
+
+        devices = _describe_devices_at_locations(locations)
+
+        for device in devices:
+            logger.info(
+                f"Found: {device.model_name} ('{device.friendly_name}') from {device.manufacturer}"
+            )
+
+        # The indexes are built before _upnp_devices is published, so any
+        # reader seeing a populated cache also sees matching indexes.
+        _index_devices(devices)
+        _upnp_devices = devices
 
     return _upnp_devices
 
 
 def _determine_streamer_device(
-    streamer_input: str | None, discovery_timeout: int
+    streamer_input: str | None,
+    discovery_timeout: int,
+    devices: list[upnpclient.Device] | None = None,
 ) -> upnpclient.Device | None:
     """Attempt to find a streamer on the network.
 
@@ -60,6 +328,9 @@ def _determine_streamer_device(
       device (by checking for /smoip/system/upnp).
     * Otherwise assume a UPnP friendly name was provided, in which case attempt
       to discover a UPnP device with that name.
+
+    If the caller has already performed a discovery pass then its devices can
+    be passed in, in which case no further discovery is triggered.
     """
     if streamer_input is None or streamer_input == "":
         # Nothing provided by the caller, so perform a UPnP discovery and
@@ -68,23 +339,27 @@ def _determine_streamer_device(
         logger.info(
             "No streamer specified, attempting to auto-discover a Cambridge Audio device"
         )
-        devices = _discover_upnp_devices(discovery_timeout)
 
-        try:
-            return [
+        if devices is None:
+            _discover_upnp_devices(discovery_timeout)
+
+        streamer_device = next(
+            (
                 device
-                for device in devices
+                for device in _devices_by_type.get("MediaRenderer", [])
                 if device.manufacturer == "Cambridge Audio"
-                and "MediaRenderer" in device.device_type
-            ][0]
-        except IndexError:
+            ),
+            None,
+        )
+
+        if streamer_device is None:
             raise VibinError(
                 "Could not find a Cambridge Audio MediaRenderer UPnP device"
             )
 
-    streamer_input_as_url = urlparse(streamer_input)
+        return streamer_device
 
-    if streamer_input_as_url.hostname is not None:
+    if streamer_input.startswith(("http://", "https://")):
         # A URL was provided by the caller. Attempt to use this as the UPnP
         # device description URL.
         logger.info(
@@ -92,7 +367,7 @@ def _determine_streamer_device(
         )
 
         try:
-            return upnpclient.Device(streamer_input)
+            return _cached_device(streamer_input)
         except requests.RequestException:
             raise VibinError(
                 f"Could not find a UPnP device at the provided streamer URL: {streamer_input}"
@@ -101,80 +376,95 @@ def _determine_streamer_device(
         # A non-URL was provided. This is probably either a UPnP friendly name
         # or a hostname. A hostname only works for Cambridge Audio devices.
 
+        def find_streamer_by_friendly_name():
+            logger.info(
+                f"Attempting to find streamer by UPnP friendly name: {streamer_input}"
+            )
+
+            if devices is None:
+                _discover_upnp_devices(discovery_timeout)
+
+            try:
+                return _devices_by_friendly_name[streamer_input]
+            except KeyError:
+                raise VibinError(
+                    f"Could not find a UPnP device with friendly name '{streamer_input}'"
+                )
+
+        if not _HOSTNAME_REGEX.match(streamer_input):
+            # The input can't be a hostname, so skip the Cambridge hostname
+            # probe (and its DNS lookup + connection attempt) and go straight
+            # to the friendly name lookup.
+            return find_streamer_by_friendly_name()
+
         # See if it's a Cambridge Audio hostname.
         try:
             logger.info(
                 f"Attempting to find streamer at provided hostname: {streamer_input}"
             )
-            response = requests.get(
-                f"http://{streamer_input}:80/smoip/system/upnp", timeout=10
+            response = _http_session.get(
+                f"http://{streamer_input}:80/smoip/system/upnp",
+                timeout=_PROBE_TIMEOUT,
             )
 
             if response.status_code == 200:
                 try:
-                    streamer = [
-                        device
-                        for device in response.json()["data"]["devices"]
-                        if device["manufacturer"] == "Cambridge Audio"
-                    ][0]
+                    streamer = next(
+                        (
+                            device
+                            for device in orjson.loads(response.content)["data"][
+                                "devices"
+                            ]
+                            if device["manufacturer"] == "Cambridge Audio"
+                        ),
+                        None,
+                    )
+
+                    if streamer is None:
+                        raise VibinError(
+                            f"Cambridge Audio device found at {streamer_input}, but "
+                            f"it did oddly not specify any devices manufactured by "
+                            f"Cambridge Audio"
+                        )
 
                     try:
-                        return upnpclient.Device(streamer["description_url"])
+                        return _cached_device(streamer["description_url"])
                     except KeyError:
                         raise VibinError(
                             f"Cambridge Audio device found at {streamer_input}, "
-                            + f"but it did not have a description_url"
+                            f"but it did not have a description_url"
                         )
                     except requests.RequestException:
                         raise VibinError(
                             f"Cambridge Audio device found at {streamer_input}, "
-                            + f"but its description_url was unsuccessful: "
-                            + f"{streamer['description_url']}"
+                            f"but its description_url was unsuccessful: "
+                            f"{streamer['description_url']}"
                         )
-                except json.decoder.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # The host responded, but the response was not JSON.
                     raise VibinError(
                         f"A host was found at {streamer_input}, but it does not "
-                        + f"appear to be a Cambridge Audio device."
+                        f"appear to be a Cambridge Audio device."
                     )
                 except KeyError:
                     # The JSON response does not include data.devices information.
                     raise VibinError(
                         f"A host was found at {streamer_input}, but it does not "
-                        + f"appear to be a Cambridge Audio device."
-                    )
-                except IndexError:
-                    raise VibinError(
-                        f"Cambridge Audio device found at {streamer_input}, but "
-                        + f"it did oddly not specify any devices manufactured by "
-                        + f"Cambridge Audio"
+                        f"appear to be a Cambridge Audio device."
                     )
         except requests.Timeout:
             raise VibinError(f"Timed out attempting to connect to {streamer_input}")
         except requests.RequestException:
             # It wasn't a Cambridge Audio host name, so see if it's one of the
             # UPnP friendly names.
-            logger.info(
-                f"Attempting to find streamer by UPnP friendly name: {streamer_input}"
-            )
-            devices = _discover_upnp_devices(discovery_timeout)
-
-            try:
-                return [
-                    device
-                    for device in devices
-                    if device.friendly_name == streamer_input
-                ][0]
-            except IndexError:
-                raise VibinError(
-                    f"Could not find a UPnP device with friendly name '{streamer_input}'"
-                )
+            return find_streamer_by_friendly_name()
 
 
 def _determine_media_server_device(
     media_server_input: str | None,
     discovery_timeout: int,
     streamer_device: upnpclient.Device,
+    devices: list[upnpclient.Device] | None = None,
 ) -> upnpclient.Device | None:
     """Attempt to find a media server on the network.
 
@@ -188,6 +478,9 @@ def _determine_media_server_device(
     * If a UPnP location URL is provided then attempt to use that.
     * Otherwise assume a UPnP friendly name was provided, in which case attempt
       to discover a UPnP device with that name.
+
+    If the caller has already performed a discovery pass then its devices can
+    be passed in, in which case no further discovery is triggered.
     """
     if media_server_input is None or media_server_input == "":
         # Nothing provided by the caller, so do one of the following:
@@ -198,36 +491,60 @@ def _determine_media_server_device(
         if streamer_device.manufacturer == "Cambridge Audio":
             logger.info(
                 f"No media server specified; looking to the Cambridge Audio "
-                + f"device '{streamer_device.friendly_name}' for its media server"
+                f"device '{streamer_device.friendly_name}' for its media server"
             )
 
             try:
-                response = requests.get(
-                    f"http://{urlparse(streamer_device.location).hostname}:80/smoip/system/upnp"
+                response = _http_session.get(
+                    f"http://{urlparse(streamer_device.location).hostname}:80/smoip/system/upnp",
+                    timeout=_PROBE_TIMEOUT,
                 )
 
-                try:
-                    # The Cambridge response includes a list of devices. Iterate
-                    # over each of those looking for the first MediaServer.
-                    media_server = [
-                        cambridge_device
-                        for cambridge_device in response.json()["data"]["devices"]
-                        if "MediaServer"
-                        in upnpclient.Device(
-                            cambridge_device["description_url"]
-                        ).device_type
-                    ][0]
-
-                    return upnpclient.Device(media_server["description_url"])
-                except IndexError:
+                # The Cambridge response includes a list of devices. Peek at
+                # each one's deviceType concurrently (one small XML GET per
+                # candidate), then pay the full Device construction only for
+                # the first MediaServer (preserving the order the streamer
+                # reported them in).
+                cambridge_devices = orjson.loads(response.content)["data"]["devices"]
+                media_server_device = None
+
+                if cambridge_devices:
+                    with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=min(8, len(cambridge_devices))
+                    ) as executor:
+                        device_types = executor.map(
+                            lambda cambridge_device: _peek_device_type(
+                                cambridge_device["description_url"]
+                            ),
+                            cambridge_devices,
+                        )
+
+                        media_server_entry = next(
+                            (
+                                cambridge_device
+                                for cambridge_device, device_type in zip(
+                                    cambridge_devices, device_types
+                                )
+                                if device_type and "MediaServer" in device_type
+                            ),
+                            None,
+                        )
+
+                    if media_server_entry is not None:
+                        media_server_device = _cached_device(
+                            media_server_entry["description_url"]
+                        )
+
+                if media_server_device is None:
                     logger.warning(
                         f"Cambridge Audio device '{streamer_device.friendly_name}' "
-                        + f"did not specify a media server device"
+                        f"did not specify a media server device"
                     )
-                    return None
+
+                return media_server_device
             except (
                 requests.RequestException,
-                json.decoder.JSONDecodeError,
+                orjson.JSONDecodeError,
                 KeyError,
                 IndexError,
             ) as e:
@@ -237,26 +554,26 @@ def _determine_media_server_device(
         else:
             # Auto-discover a MediaServer device.
             logger.info("No media server specified, attempting auto-discovery")
-            devices = _discover_upnp_devices(discovery_timeout)
 
-            try:
-                return [
-                    device for device in devices if "MediaServer" in device.device_type
-                ][0]
-            except IndexError:
+            if devices is None:
+                _discover_upnp_devices(discovery_timeout)
+
+            media_servers = _devices_by_type.get("MediaServer", [])
+
+            if not media_servers:
                 logger.warning("Could not find a MediaServer UPnP device")
                 return None
 
-    media_input_as_url = urlparse(media_server_input)
+            return media_servers[0]
 
-    if media_input_as_url.hostname is not None:
+    if media_server_input.startswith(("http://", "https://")):
         # Check UPnP location url
         logger.info(
             f"Attempting to find media server at provided URL: {media_server_input}"
         )
 
         try:
-            return upnpclient.Device(media_server_input)
+            return _cached_device(media_server_input)
         except requests.RequestException:
             raise VibinError(
                 f"Could not find a UPnP device at the provided media server URL: {media_server_input}"
@@ -266,15 +583,13 @@ def _determine_media_server_device(
         logger.info(
             f"Attempting to find media server by UPnP friendly name: {media_server_input}"
         )
-        devices = _discover_upnp_devices(discovery_timeout)
+
+        if devices is None:
+            _discover_upnp_devices(discovery_timeout)
 
         try:
-            return [
-                device
-                for device in devices
-                if device.friendly_name == media_server_input
-            ][0]
-        except IndexError:
+            return _devices_by_friendly_name[media_server_input]
+        except KeyError:
             raise VibinError(
                 f"Could not find a UPnP device with friendly name '{media_server_input}'"
             )
@@ -284,6 +599,7 @@ def _determine_amplifier_device(
     amplifier_input: str | None,
     discovery_timeout: int,
     streamer_device: upnpclient.Device,
+    devices: list[upnpclient.Device] | None = None,
 ) -> upnpclient.Device | None:
     """Attempt to find an amplifier on the network.
 
@@ -296,6 +612,9 @@ def _determine_amplifier_device(
     * If a UPnP location URL is provided then attempt to use that.
     * If a UPnP friendly name was provided, attempt to discover a UPnP device
       with that name.
+
+    If the caller has already performed a discovery pass then its devices can
+    be passed in, in which case no further discovery is triggered.
     """
     if amplifier_input is None or amplifier_input == "":
         # Nothing provided by the caller, so perform a UPnP discovery and
@@ -304,40 +623,32 @@ def _determine_amplifier_device(
         logger.info(
             "No amplifier specified, attempting to auto-discover a UPnP MediaRenderer"
         )
-        devices = _discover_upnp_devices(discovery_timeout)
 
-        try:
-            media_renderers = [
-                device
-                for device in devices
-                if "MediaRenderer" in device.device_type
-            ]
+        if devices is None:
+            _discover_upnp_devices(discovery_timeout)
+
+        media_renderers = _devices_by_type.get("MediaRenderer", [])
+
+        if len(media_renderers) == 1:
+            # This allows for the streamer device to also be the amplifier
+            # device if there's only one MediaRenderer.
+            return media_renderers[0]
+
+        # No MediaRenderers (next() returning None) is not an error state for
+        # amplifiers (amplifiers are optional for Vibin).
+        return next(
+            (device for device in media_renderers if device != streamer_device),
+            None,
+        )
 
-            if len(media_renderers) == 1:
-                # This allows for the streamer device to also be the amplifier
-                # device if there's only one MediaRenderer.
-                return media_renderers[0]
-            else:
-                return [
-                    device
-                    for device in media_renderers
-                    if device != streamer_device
-                ][0]
-        except IndexError:
-            # No MediaRenderers is not an error state for amplifiers (amplifiers
-            # are optional for Vibin).
-            return None
-
-    amplifier_input_as_url = urlparse(amplifier_input)
-
-    if amplifier_input_as_url.hostname is not None:
+    if amplifier_input.startswith(("http://", "https://")):
         # Check UPnP location url
         logger.info(
             f"Attempting to find amplifier at provided URL: {amplifier_input}"
         )
 
         try:
-            return upnpclient.Device(amplifier_input)
+            return _cached_device(amplifier_input)
         except requests.RequestException:
             raise VibinError(
                 f"Could not find a UPnP device at the provided amplifier URL: {amplifier_input}"
@@ -347,15 +658,13 @@ def _determine_amplifier_device(
         logger.info(
             f"Attempting to find amplifier by UPnP friendly name: {amplifier_input}"
         )
-        devices = _discover_upnp_devices(discovery_timeout)
+
+        if devices is None:
+            _discover_upnp_devices(discovery_timeout)
 
         try:
-            return [
-                device
-                for device in devices
-                if device.friendly_name == amplifier_input
-            ][0]
-        except IndexError:
+            return _devices_by_friendly_name[amplifier_input]
+        except KeyError:
             raise VibinError(
                 f"Could not find a UPnP device with friendly name '{amplifier_input}'"
             )
@@ -369,68 +678,132 @@ def determine_devices(
 ) -> (upnpclient.Device, upnpclient.Device | None, upnpclient.Device | None):
     """Attempt to locate a streamer and (optionally) a media server on the network."""
 
-    streamer_device = _determine_streamer_device(streamer_input, discovery_timeout)
+    # A single discovery pass is shared by all the lookups below which need
+    # one; each lookup which is passed the devices list won't trigger its own
+    # discovery.
+    devices = None
 
-    media_server_device = None
+    if streamer_input is None or streamer_input == "":
+        # The streamer auto-discovery path always needs the discovered
+        # devices, so perform the discovery up front.
+        devices = _discover_upnp_devices(discovery_timeout)
 
-    if media_server_input is not False:
-        media_server_device = _determine_media_server_device(
-            None if media_server_input is True else media_server_input,
-            discovery_timeout,
-            streamer_device,
-        )
+    streamer_device = _determine_streamer_device(
+        streamer_input, discovery_timeout, devices
+    )
 
+    media_server_device = None
     amplifier_device = None
 
-    if amplifier_input is not False:
+    media_server_lookup = None if media_server_input is True else media_server_input
+    amplifier_lookup = None if amplifier_input is True else amplifier_input
+
+    if media_server_input is not False and amplifier_input is not False:
+        # The media server and amplifier lookups are independent of each other
+        # once the streamer is known, so run them concurrently. Any UPnP
+        # discovery either of them might need is performed once up front, so
+        # the two lookups don't each start their own SSDP scan.
+        if devices is None and any(
+            lookup is None or not lookup.startswith(("http://", "https://"))
+            for lookup in (media_server_lookup, amplifier_lookup)
+        ):
+            devices = _discover_upnp_devices(discovery_timeout)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            media_server_future = executor.submit(
+                _determine_media_server_device,
+                media_server_lookup,
+                discovery_timeout,
+                streamer_device,
+                devices,
+            )
+            amplifier_future = executor.submit(
+                _determine_amplifier_device,
+                amplifier_lookup,
+                discovery_timeout,
+                streamer_device,
+                devices,
+            )
+
+            media_server_device = media_server_future.result()
+            amplifier_device = amplifier_future.result()
+    elif media_server_input is not False:
+        media_server_device = _determine_media_server_device(
+            media_server_lookup, discovery_timeout, streamer_device, devices
+        )
+    elif amplifier_input is not False:
         amplifier_device = _determine_amplifier_device(
-            None if amplifier_input is True else amplifier_input,
-            discovery_timeout,
-            streamer_device,
+            amplifier_lookup, discovery_timeout, streamer_device, devices
         )
 
     return streamer_device, media_server_device, amplifier_device
 
 
-def determine_streamer_class(streamer_device, streamer_type):
-    """Determine which Streamer implementation matches the streamer_device."""
+def _implementation_registry(
+    module, base_class, model_overrides
+) -> tuple[list, dict, dict]:
+    """Build a list of all implementations of base_class found in module; a
+    map of device model name to implementation (with any model_overrides
+    merged in); and a map of implementation class name to implementation.
 
-    # Build a list of all known Streamer implementations; and a map of device
-    # model name to Streamer implementation.
-    known_streamers = []
-    known_streamers_by_model: dict[str, Streamer] = {}
+    Called once per base class at import time; the module contents don't
+    change at runtime.
+    """
+    known_implementations = []
+    known_by_model = {}
+    known_by_name = {}
 
-    for name, obj in inspect.getmembers(streamers):
-        if inspect.isclass(obj) and issubclass(obj, Streamer):
-            known_streamers.append(obj)
-            known_streamers_by_model[obj.model_name] = obj
+    for name, obj in inspect.getmembers(module):
+        if inspect.isclass(obj) and issubclass(obj, base_class):
+            known_implementations.append(obj)
+            known_by_model[obj.model_name] = obj
+            known_by_name[obj.__name__] = obj
 
     # Inject any model additions/overrides
-    known_streamers_by_model.update(model_to_streamer)
+    known_by_model.update(model_overrides)
+
+    return known_implementations, known_by_model, known_by_name
+
+
+# The registries of Streamer/MediaServer/Amplifier implementations are
+# identical for every Vibin instance, so they're built once at import time
+# rather than on every device resolution.
+KNOWN_STREAMERS, KNOWN_STREAMERS_BY_MODEL, KNOWN_STREAMERS_BY_NAME = (
+    _implementation_registry(streamers, Streamer, model_to_streamer)
+)
+KNOWN_MEDIA_SERVERS, KNOWN_MEDIA_SERVERS_BY_MODEL, KNOWN_MEDIA_SERVERS_BY_NAME = (
+    _implementation_registry(mediaservers, MediaServer, model_to_media_server)
+)
+KNOWN_AMPLIFIERS, KNOWN_AMPLIFIERS_BY_MODEL, KNOWN_AMPLIFIERS_BY_NAME = (
+    _implementation_registry(amplifiers, Amplifier, model_to_amplifier)
+)
+
+
+def determine_streamer_class(streamer_device, streamer_type):
+    """Determine which Streamer implementation matches the streamer_device."""
+    if streamer_device is None:
+        # Fail fast rather than letting the model_name lookup raise an
+        # AttributeError (which could also trigger a pointless rediscovery on
+        # restart).
+        raise VibinError("Cannot determine Streamer implementation: no streamer device")
 
     # Determine which Streamer implementation to use
     try:
         if streamer_type is None:
-            streamer_class = known_streamers_by_model[streamer_device.model_name]
+            streamer_class = KNOWN_STREAMERS_BY_MODEL[streamer_device.model_name]
         else:
             # A specific Streamer implementation was requested.
-            streamer_class = next(
-                (
-                    streamer for streamer in known_streamers
-                    if streamer.__name__ == streamer_type
-                ),
-                None
-            )
+            streamer_class = KNOWN_STREAMERS_BY_NAME.get(streamer_type)
 
             if streamer_class is None:
                 raise VibinError(
                     f"Could not find Vibin implementation for requested "
-                    + f"streamer type: {streamer_type}"
+                    f"streamer type: {streamer_type}"
                 )
     except KeyError:
         raise VibinError(
             f"Could not find Vibin implementation for streamer model "
-            + f"'{streamer_device.model_name}'"
+            f"'{streamer_device.model_name}'"
         )
 
     return streamer_class
@@ -438,45 +811,30 @@ def determine_streamer_class(streamer_device, streamer_type):
 
 def determine_media_server_class(media_server_device, media_server_type):
     """Determine which MediaServer implementation matches the media_server_device."""
-
-    # Build a list of all known MediaServer implementations; and a map of
-    # device model name to MediaServer implementation.
-    known_media_servers = []
-    known_media_servers_by_model: dict[str, MediaServer] = {}
-
-    for name, obj in inspect.getmembers(mediaservers):
-        if inspect.isclass(obj) and issubclass(obj, MediaServer):
-            known_media_servers.append(obj)
-            known_media_servers_by_model[obj.model_name] = obj
-
-    # Inject any additions/overrides
-    known_media_servers_by_model.update(model_to_media_server)
+    if media_server_device is None:
+        raise VibinError(
+            "Cannot determine MediaServer implementation: no media server device"
+        )
 
     # Determine which MediaServer implementation to use
     try:
         if media_server_type is None:
-            media_server_class = known_media_servers_by_model[
+            media_server_class = KNOWN_MEDIA_SERVERS_BY_MODEL[
                 media_server_device.model_name
             ]
         else:
             # A specific MediaServer implementation was requested.
-            media_server_class = next(
-                (
-                    media_server for media_server in known_media_servers
-                    if media_server.__name__ == media_server_type
-                ),
-                None
-            )
+            media_server_class = KNOWN_MEDIA_SERVERS_BY_NAME.get(media_server_type)
 
             if media_server_class is None:
                 raise VibinError(
                     f"Could not find Vibin implementation for requested "
-                    + f"media server type: {media_server_type}"
+                    f"media server type: {media_server_type}"
                 )
     except KeyError:
         raise VibinError(
             f"Could not find Vibin implementation for media server model "
-            + f"'{media_server_device.model_name}'"
+            f"'{media_server_device.model_name}'"
         )
 
     return media_server_class
@@ -484,45 +842,30 @@ def determine_media_server_class(media_server_device, media_server_type):
 
 def determine_amplifier_class(amplifier_device, amplifier_type):
     """Determine which Amplifier implementation matches the amplifier_device."""
-
-    # Build a list of all known Amplifier implementations; and a map of
-    # device model name to Amplifier implementation.
-    known_amplifiers = []
-    known_amplifiers_by_model: dict[str, Amplifier] = {}
-
-    for name, obj in inspect.getmembers(amplifiers):
-        if inspect.isclass(obj) and issubclass(obj, Amplifier):
-            known_amplifiers.append(obj)
-            known_amplifiers_by_model[obj.model_name] = obj
-
-    # Inject any additions/overrides
-    known_amplifiers_by_model.update(model_to_amplifier)
+    if amplifier_device is None:
+        raise VibinError(
+            "Cannot determine Amplifier implementation: no amplifier device"
+        )
 
     # Determine which Amplifier implementation to use
     try:
         if amplifier_type is None:
-            amplifier_class = known_amplifiers_by_model[
+            amplifier_class = KNOWN_AMPLIFIERS_BY_MODEL[
                 amplifier_device.model_name
             ]
         else:
             # A specific Amplifier implementation was requested.
-            amplifier_class = next(
-                (
-                    amplifier for amplifier in known_amplifiers
-                    if amplifier.__name__ == amplifier_type
-                ),
-                None
-            )
+            amplifier_class = KNOWN_AMPLIFIERS_BY_NAME.get(amplifier_type)
 
             if amplifier_class is None:
                 raise VibinError(
                     f"Could not find Vibin implementation for requested "
-                    + f"amplifier type: {amplifier_type}"
+                    f"amplifier type: {amplifier_type}"
                 )
     except KeyError:
         raise VibinError(
             f"Could not find Vibin implementation for amplifier model "
-            + f"'{amplifier_device.model_name}'"
+            f"'{amplifier_device.model_name}'"
         )
 
     return amplifier_class
@@ -6,6 +6,12 @@ from vibin import VibinError
 from vibin.external_services import ExternalService
 from vibin.models import ExternalServiceLink, LyricsChunk
 
+# Precompiled patterns for lyric parsing (see Genius.lyrics()). These are
+# compiled once at import time as lyrics() applies them per-chunk.
+_LYRICS_PREFIX = re.compile(r"^.*Lyrics")
+_LYRICS_SUFFIX = re.compile(r"\d*Embed$")
+_CHUNK_HEADER = re.compile(r"^\[([^\[\]]+)\]$")
+
 
 class Genius(ExternalService):
     """External service handler for Genius.
@@ -127,48 +133,40 @@ class Genius(ExternalService):
             # be far better not to use a lyrics scraper.
             #
             # The lyrics also sometimes include a string like "[Chorus]" on its
-            # own line. These denote a "chunk". Usually a line like "[Chorus]"
-            # is preceded by two newlines, but sometimes it's not -- so we also
-            # enforce at least new newlines so we can later split on multiple
-            # newlines to isolate each chuck.
+            # own line. These denote a "chunk". A "[Chorus]" line always starts
+            # a new chunk, whether or not it's preceded by a blank line.
 
             lyrics = song.lyrics
 
             lyrics = lyrics.replace("You might also like", "")
 
-            # Enforce at least two newlines before any line looking like
-            # "[Chorus]".
-            chunks_as_strings = re.split(
-                r"\n{2,}", re.sub(r"(\n\[[^\[\]]+\])", r"\n\1", lyrics)
-            )
-
             # The lyrics scraper prepends the first line of lyrics with
-            # "<song title>Lyrics", so we remove that if we see it.
-            chunks_as_strings[0] = re.sub(r"^.*Lyrics", "", chunks_as_strings[0])
-
-            # The scraper also might append "<digits>Embed" to the last line.
-            chunks_as_strings[-1] = re.sub(r"\d*Embed$", "", chunks_as_strings[-1])
+            # "<song title>Lyrics", so we remove that if we see it. The
+            # scraper also might append "<digits>Embed" to the last line.
+            lyrics = _LYRICS_PREFIX.sub("", lyrics, count=1)
+            lyrics = _LYRICS_SUFFIX.sub("", lyrics)
+
+            # Build the chunks in a single pass over the lyric lines. A blank
+            # line ends the current chunk, and a "[Header]" line starts a new
+            # chunk.
+            results = []
+            current_chunk: LyricsChunk | None = None
 
-            chunks_as_arrays = [chunk.split("\n") for chunk in chunks_as_strings]
+            for line in lyrics.splitlines():
+                if line == "":
+                    current_chunk = None
+                    continue
 
-            results = []
+                chunk_header = _CHUNK_HEADER.match(line)
 
-            for chunk in chunks_as_arrays:
-                chunk_header = re.match(r"^\[([^\[\]]+)\]$", chunk[0])
-                if chunk_header:
-                    results.append(
-                        LyricsChunk(
-                            header=chunk_header.group(1),
-                            body=chunk[1:],
-                        )
+                if chunk_header or current_chunk is None:
+                    current_chunk = LyricsChunk(
+                        header=chunk_header.group(1) if chunk_header else None,
+                        body=[] if chunk_header else [line],
                     )
+                    results.append(current_chunk)
                 else:
-                    results.append(
-                        LyricsChunk(
-                            header=None,
-                            body=chunk,
-                        )
-                    )
+                    current_chunk.body.append(line)
 
             return results
         except (KeyError, IndexError) as e:
@@ -1,10 +1,10 @@
+from collections import OrderedDict
 import re
 
+from lxml import etree
 import requests
 from tinydb import Query
 from tinydb.table import Table
-import xml
-import xmltodict
 
 from vibin import VibinError, VibinNotFoundError
 from vibin.external_services import ExternalService
@@ -36,6 +36,14 @@ class LyricsManager:
         self._media_server = media_server
         self._external_service = genius_service
 
+        # In-memory LRU cache of recently-seen Lyrics, keyed by storage ID.
+        # This sits in front of the database to avoid a database read every
+        # time a track is played. The cache is bounded so a long-running
+        # server doesn't slowly accumulate every track's lyrics in memory
+        # (the database remains the persistent store).
+        self._lyrics_cache: OrderedDict[str, Lyrics] = OrderedDict()
+        self._lyrics_cache_size = 256
+
     @requires_external_service_token
     @requires_media_server()
     def lyrics_for_track(
@@ -61,13 +69,20 @@ class LyricsManager:
 
             return f"{artist}::{title}"
 
+        lyrics_id = storage_id(track_id, artist, title)
+
+        # Check the in-memory cache before going to the database
+        if update_cache:
+            self._lyrics_cache.pop(lyrics_id, None)
+        elif lyrics_id in self._lyrics_cache:
+            self._lyrics_cache.move_to_end(lyrics_id)
+            return self._lyrics_cache[lyrics_id]
+
         # Check if lyrics are already stored
         StoredLyricsQuery = Query()
 
         with DB_ACCESS_LOCK_LYRICS:
-            stored_lyrics = self._db.get(
-                StoredLyricsQuery.lyrics_id == storage_id(track_id, artist, title)
-            )
+            stored_lyrics = self._db.get(StoredLyricsQuery.lyrics_id == lyrics_id)
 
         if stored_lyrics is not None:
             if update_cache:
@@ -75,18 +90,24 @@ class LyricsManager:
                     self._db.remove(doc_ids=[stored_lyrics.doc_id])
             else:
                 lyrics_data = Lyrics(**stored_lyrics)
+                self._cache_lyrics(lyrics_data)
                 return lyrics_data
 
         if track_id:
-            # Extract artist and title from the media metadata
+            # Extract artist and title from the media metadata. Only two
+            # fields are needed, so they're plucked out of the DIDL-Lite XML
+            # directly rather than converting the entire document to a dict.
             try:
-                track_info = xmltodict.parse(self._media_server.get_metadata(track_id))
+                track_info = etree.fromstring(
+                    self._media_server.get_metadata(track_id).encode("utf-8")
+                )
 
-                artist = track_info["DIDL-Lite"]["item"]["dc:creator"]
-                title = track_info["DIDL-Lite"]["item"]["dc:title"]
-            except xml.parsers.expat.ExpatError as e:
+                ns = {"dc": "http://purl.org/dc/elements/1.1/"}
+                artist = track_info.findtext(".//dc:creator", namespaces=ns)
+                title = track_info.findtext(".//dc:title", namespaces=ns)
+            except etree.XMLSyntaxError as e:
                 logger.error(
-                    f"Could not convert XML to JSON for track: {track_id}: {e}"
+                    f"Could not parse metadata XML for track: {track_id}: {e}"
                 )
                 return None
 
@@ -102,7 +123,7 @@ class LyricsManager:
                 raise VibinError(f"Error retrieving lyrics: {e}")
 
             lyric_data = Lyrics(
-                lyrics_id=storage_id(track_id, artist, title),
+                lyrics_id=lyrics_id,
                 media_id=track_id,
                 is_valid=True,
                 chunks=lyric_chunks if lyric_chunks is not None else [],
@@ -111,6 +132,8 @@ class LyricsManager:
             with DB_ACCESS_LOCK_LYRICS:
                 self._db.insert(lyric_data.dict())
 
+            self._cache_lyrics(lyric_data)
+
             return lyric_data
         except VibinError as e:
             logger.error(e)
@@ -131,6 +154,21 @@ class LyricsManager:
         with DB_ACCESS_LOCK_LYRICS:
             self._db.update({"is_valid": is_valid}, doc_ids=[stored_lyrics.doc_id])
 
+        # Drop any cached copy; it no longer reflects the stored lyrics.
+        self._lyrics_cache.pop(lyrics_id, None)
+
+    def _cache_lyrics(self, lyrics: Lyrics):
+        """Add the given Lyrics to the in-memory cache.
+
+        Evicts the least-recently-used entries if the cache has grown past
+        its maximum size.
+        """
+        self._lyrics_cache[lyrics.lyrics_id] = lyrics
+        self._lyrics_cache.move_to_end(lyrics.lyrics_id)
+
+        while len(self._lyrics_cache) > self._lyrics_cache_size:
+            self._lyrics_cache.popitem(last=False)
+
     def search(self, search_query: str) -> list[MediaId]:
         """Search the local lyrics database for the given search_query string.
 
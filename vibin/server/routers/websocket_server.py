@@ -146,10 +146,49 @@ class ConnectionManager:
             f"Could not convert message payload of type '{type(message_payload)}' to string"
         )
 
+    def prepare_message_payload(
+        self, message_type: UpdateMessageType, message_payload: Any
+    ) -> Any:
+        """
+        Convert an outgoing message payload into a JSON-friendly object.
+
+        The result is identical for every client receiving the message, so
+        this per-message work (string conversion, JSON parse, proxy URL
+        rewriting) is performed once per message rather than once per
+        connected client. The result is intended to be passed to
+        build_message() for each target client.
+        """
+        message_payload_str = self.message_payload_to_str(message_payload)
+
+        try:
+            payload = json.loads(message_payload_str)
+        except TypeError:
+            # Getting here is unexpected. If for some reason the message_str is
+            # not JSON-friendly then we just pass it on as raw text.
+            logger.warning(
+                f"Message could not be parsed as JSON; sending as plain "
+                + f"text: {message_payload_str}"
+            )
+            payload = message_payload_str
+
+        # Some messages contain media server urls that we may want to proxy.
+        if is_proxy_for_media_server() and message_type in [
+            "CurrentlyPlaying",
+            "Favorites",
+            "Presets",
+            "System",
+            "UPnPProperties",
+        ]:
+            payload = replace_media_server_urls_with_proxy(
+                payload, get_media_server_proxy_target()
+            )
+
+        return payload
+
     def build_message(
         self,
         message_type: UpdateMessageType,
-        message_payload_str: str,
+        message_payload: Any,
         client_ws: WebSocket = None,
     ) -> str:
         """
@@ -160,45 +199,19 @@ class ConnectionManager:
             * client_id: The ID of the client the message is being sent to.
             * time: A timestamp for when the message was created.
             * type: The message type.
-            * payload: The message payload.
-
-        Will update any payload URLs to point to the proxy if required.
+            * payload: The message payload (from prepare_message_payload()).
 
         Note: Each message contains a client_id, which is why each built
             message is client-specific -- requiring client_ws be passed.
         """
-        # Create a message shell. The payload will be updated later.
         message = {
             "id": str(uuid.uuid4()),
             "client_id": self.active_connections[client_ws]["id"],
             "time": int(time.time() * 1000),
             "type": message_type,
-            "payload": None,
+            "payload": message_payload,
         }
 
-        try:
-            message["payload"] = json.loads(message_payload_str)
-        except TypeError:
-            # Getting here is unexpected. If for some reason the message_str is
-            # not JSON-friendly then we just pass it on as raw text.
-            logger.warning(
-                f"Message could not be parsed as JSON; sending as plain "
-                + f"text: {message_payload_str}"
-            )
-            message["payload"] = message_payload_str
-
-        # Some messages contain media server urls that we may want to proxy.
-        if is_proxy_for_media_server() and message_type in [
-            "CurrentlyPlaying",
-            "Favorites",
-            "Presets",
-            "System",
-            "UPnPProperties",
-        ]:
-            message = replace_media_server_urls_with_proxy(
-                message, get_media_server_proxy_target()
-            )
-
         return json.dumps(message)
 
     async def auto_broadcast(self) -> None:
@@ -212,7 +225,9 @@ class ConnectionManager:
             to_send: UpdateMessage = await self.message_queue.get()
 
             try:
-                message_payload_str = self.message_payload_to_str(to_send.payload)
+                message_payload = self.prepare_message_payload(
+                    to_send.message_type, to_send.payload
+                )
                 defunct_clients = []
 
                 for client_websocket in self.active_connections.keys():
@@ -227,7 +242,7 @@ class ConnectionManager:
                         await client_websocket.send_text(
                             self.build_message(
                                 to_send.message_type,
-                                message_payload_str,
+                                message_payload,
                                 client_websocket,
                             )
                         )
@@ -260,7 +275,9 @@ class ConnectionManager:
     ) -> None:
         """Send a message to a single client."""
         try:
-            message_str = self.message_payload_to_str(message_payload)
+            prepared_payload = self.prepare_message_payload(
+                message_type, message_payload
+            )
         except VibinError as e:
             logger.warning(f"Could not send message over Websocket: {e}")
             return
@@ -274,7 +291,7 @@ class ConnectionManager:
 
         try:
             await websocket.send_text(
-                self.build_message(message_type, message_str, websocket)
+                self.build_message(message_type, prepared_payload, websocket)
             )
         except RuntimeError as e:
             logger.warning(f"Error performing single-client WebSocket send: {e}")
@@ -15,6 +15,7 @@ import xml.etree.ElementTree as ET
 
 from deepdiff import DeepDiff
 from lxml import etree
+import orjson
 import requests
 import untangle
 import upnpclient
@@ -108,6 +109,22 @@ def retry_on_bad_navigator(method):
     return wrapper_retry_on_bad_navigator
 
 
+def wrap_soap_errors(method):
+    """Decorator to re-raise UPnP/SOAP errors as VibinDeviceError.
+
+    Intended for methods which invoke UPnP actions on the streamer, so each
+    of them doesn't need to repeat the same try/except wrapping.
+    """
+    @functools.wraps(method)
+    def wrapper_wrap_soap_errors(self, *method_args, **method_kwargs):
+        try:
+            return method(self, *method_args, **method_kwargs)
+        except (upnpclient.UPNPError, upnpclient.soap.SOAPError) as e:
+            raise VibinDeviceError(e)
+
+    return wrapper_wrap_soap_errors
+
+
 class StreamMagic(Streamer):
     model_name = "StreamMagic"
 
@@ -363,6 +380,7 @@ class StreamMagic(Streamer):
     def transport_state(self) -> TransportState:
         return self._transport_state
 
+    @wrap_soap_errors
     def play(self):
         if self._transport_state.play_state == "play":
             return
@@ -372,6 +390,7 @@ class StreamMagic(Streamer):
         else:
             self._av_transport.Play(InstanceID=self._instance_id, Speed="1")
 
+    @wrap_soap_errors
     def pause(self):
         if self._transport_state.play_state == "pause":
             return
@@ -386,9 +405,11 @@ class StreamMagic(Streamer):
             f"http://{self._device_hostname}/smoip/zone/play_control?action=toggle"
         )
 
+    @wrap_soap_errors
     def stop(self):
         self._av_transport.Stop(InstanceID=self._instance_id)
 
+    @wrap_soap_errors
     def seek(self, target: SeekTarget):
         if "seek" not in self.active_transport_controls:
             # TODO: Establish consistent way of handling "currently unavailable"
@@ -435,6 +456,7 @@ class StreamMagic(Streamer):
             f"http://{self._device_hostname}/smoip/zone/play_control?skip_track=-1"
         )
 
+    @wrap_soap_errors
     def repeat(
         self, state: TransportRepeatState | Literal["toggle"] = "toggle"
     ) -> TransportRepeatState:
@@ -447,6 +469,7 @@ class StreamMagic(Streamer):
 
         return self._transport_state.repeat
 
+    @wrap_soap_errors
     def shuffle(
         self, state: TransportShuffleState | Literal["toggle"] = "toggle"
     ) -> TransportShuffleState:
@@ -498,37 +521,34 @@ class StreamMagic(Streamer):
         return self._currently_playing.playlist
 
     @retry_on_bad_navigator
+    @wrap_soap_errors
     def modify_playlist(
         self,
         metadata: str,
         action: PlaylistModifyAction = "REPLACE",
         insert_index: int | None = None,  # Only used by INSERT action
     ):
-        try:
-            if action == "INSERT":
-                # INSERT. This works for Tracks only (not Albums).
-                # TODO: Add check to ensure metadata is for a Track.
-                result = self._uu_vol_control.InsertPlaylistTrack(
-                    InsertPosition=insert_index, TrackData=metadata
-                )
-            else:
-                # REPLACE, PLAY_NOW, PLAY_NEXT, PLAY_FROM_HERE, APPEND
-                queue_folder_response = self._uu_vol_control.QueueFolder(
-                    ServerUDN=self._media_server.device_udn,
-                    Action=action,
-                    NavigatorId=self._navigator_id,
-                    ExtraInfo="",
-                    DIDL=metadata,
-                )
+        if action == "INSERT":
+            # INSERT. This works for Tracks only (not Albums).
+            # TODO: Add check to ensure metadata is for a Track.
+            result = self._uu_vol_control.InsertPlaylistTrack(
+                InsertPosition=insert_index, TrackData=metadata
+            )
+        else:
+            # REPLACE, PLAY_NOW, PLAY_NEXT, PLAY_FROM_HERE, APPEND
+            queue_folder_response = self._uu_vol_control.QueueFolder(
+                ServerUDN=self._media_server.device_udn,
+                Action=action,
+                NavigatorId=self._navigator_id,
+                ExtraInfo="",
+                DIDL=metadata,
+            )
 
-                if queue_folder_response["Result"] == "BAD_NAVIGATOR":
-                    logger.warning("StreamMagic navigator is bad")
-                    raise StreamMagicBadNavigatorError()
-        except (upnpclient.UPNPError, upnpclient.soap.SOAPError) as e:
-            # TODO: Look at using VibinDeviceError wherever things like
-            #   _uu_vol_control are being used.
-            raise VibinDeviceError(e)
+            if queue_folder_response["Result"] == "BAD_NAVIGATOR":
+                logger.warning("StreamMagic navigator is bad")
+                raise StreamMagicBadNavigatorError()
 
+    @wrap_soap_errors
     def play_playlist_index(self, index: int):
         self._uu_vol_control.SetCurrentPlaylistTrack(CurrentPlaylistTrackID=index)
 
@@ -1067,8 +1087,10 @@ class StreamMagic(Streamer):
     def _process_streamer_message(self, update: Data) -> None:
         """Process a single incoming message from the StreamMagic WebSocket server."""
         try:
-            self._process_update_message(json.loads(update))
-        except (KeyError, json.decoder.JSONDecodeError):
+            # orjson is used here as this is a hot path (the streamer sends
+            # at least one message per second).
+            self._process_update_message(orjson.loads(update))
+        except (KeyError, orjson.JSONDecodeError):
             # TODO: This currently quietly ignores unexpected payload formats
             #   or missing keys. Consider adding error handling if errors need
             #   to be announced.
@@ -24,6 +24,14 @@ import websockets
 from websockets.legacy.client import WebSocketClientProtocol
 from websockets.typing import Data
 
+# uvloop is an optional speedup for the WebSocket event loops. It's expected
+# to be present (it comes with uvicorn[standard] on supported platforms), but
+# everything works on the stdlib event loop without it.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from vibin import VibinError, VibinMissingDependencyError
 from vibin.constants import UI_APPNAME, UI_BUILD_DIR, UI_REPOSITORY, UI_ROOT
 from vibin.logger import logger
@@ -274,9 +282,7 @@ class WebsocketThread(StoppableThread):
         :param on_data: Called when data is received via the Websocket.
         :param on_disconnect: Called when the connection is broken.
         """
-        super().__init__(
-            target=lambda: asyncio.run(self._handle_websocket()), *args, **kwargs
-        )
+        super().__init__(target=self._run_websocket_loop, *args, **kwargs)
         self._uri = uri
         self._on_connect = on_connect
         self._on_data = on_data
@@ -288,6 +294,23 @@ class WebsocketThread(StoppableThread):
     def connected(self):
         return self._connected
 
+    def _run_websocket_loop(self):
+        """
+        Run the Websocket handler on a new event loop for this thread.
+
+        Uses uvloop for the event loop when it's available, falling back to
+        the stdlib event loop otherwise.
+        """
+        loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+
+        try:
+            loop.run_until_complete(self._handle_websocket())
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
     async def _handle_websocket(self):
         logger.info(
             f"Connecting to {self._friendly_name} WebSocket server on {self._uri}"